@@ -1,32 +1,75 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from bson import ObjectId
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, field_validator
+from pydantic_settings import BaseSettings, NoDecode
+from typing import Annotated, List, Optional
 import uuid
 from datetime import datetime, timezone, timedelta
 import jwt
 import bcrypt
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError
+from cachetools import TTLCache
 from enum import Enum
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+class Settings(BaseSettings):
+    mongo_url: str
+    db_name: str
+    jwt_secret: str = 'your-secret-key-change-in-production'
+    cors_origins: Annotated[List[str], NoDecode] = ["*"]
+
+    @field_validator("cors_origins", mode="before")
+    @classmethod
+    def split_cors_origins(cls, value):
+        if isinstance(value, str):
+            if value.strip() == "*":
+                return ["*"]
+            return [origin.strip() for origin in value.split(",") if origin.strip()]
+        return value
+
+settings = Settings()
+
+client = AsyncIOMotorClient(
+    settings.mongo_url,
+    tz_aware=True,
+    maxPoolSize=200,
+    minPoolSize=20,
+    maxIdleTimeMS=60000,
+    serverSelectionTimeoutMS=3000,
+    waitQueueTimeoutMS=2000
+)
+db = client[settings.db_name]
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
-JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key-change-in-production')
+JWT_SECRET = settings.jwt_secret
 JWT_ALGORITHM = "HS256"
+JWT_KEY = JWT_SECRET.encode('utf-8')
+jwt_codec = jwt.PyJWT(options={"require": ["exp", "user_id"]})
 security = HTTPBearer()
+password_hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=4)
+password_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+MAX_PAGE_SIZE = 1000
+
+token_cache = TTLCache(maxsize=10000, ttl=300)
+token_cache_lock = asyncio.Lock()
+days_used_cache = TTLCache(maxsize=10000, ttl=300)
 
 class UserRole(str, Enum):
     ADMIN = "admin"
@@ -48,7 +91,7 @@ class PermitStatus(str, Enum):
 
 class User(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     email: EmailStr
     name: str
     role: UserRole
@@ -56,6 +99,8 @@ class User(BaseModel):
     hire_date: Optional[datetime] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+USER_PROJECTION = {"_id": 0, **{field: 1 for field in User.model_fields}}
+
 class UserCreate(BaseModel):
     email: EmailStr
     password: str
@@ -70,7 +115,7 @@ class LoginRequest(BaseModel):
 
 class Permit(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     teacher_id: str
     teacher_name: str
     permit_type: PermitType
@@ -84,6 +129,8 @@ class Permit(BaseModel):
     reviewed_by: Optional[str] = None
     rejection_reason: Optional[str] = None
 
+PERMIT_PROJECTION = {"_id": 0, **{field: 1 for field in Permit.model_fields}}
+
 class PermitCreate(BaseModel):
     permit_type: PermitType
     start_date: datetime
@@ -97,13 +144,15 @@ class PermitReview(BaseModel):
 
 class Notification(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     user_id: str
     title: str
     message: str
     read: bool = False
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+NOTIFICATION_PROJECTION = {"_id": 0, **{field: 1 for field in Notification.model_fields}}
+
 class DaysAvailable(BaseModel):
     vacation_period_1: int
     vacation_period_2: int
@@ -113,10 +162,18 @@ class DaysAvailable(BaseModel):
     total_economic: int
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return password_hasher.hash(password)
+
+def is_legacy_hash(hashed: str) -> bool:
+    return hashed.startswith("$2")
 
 def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    if is_legacy_hash(hashed):
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    try:
+        return password_hasher.verify(hashed, password)
+    except VerifyMismatchError:
+        return False
 
 def create_token(user_id: str, email: str, role: str) -> str:
     payload = {
@@ -125,22 +182,40 @@ def create_token(user_id: str, email: str, role: str) -> str:
         "role": role,
         "exp": datetime.now(timezone.utc) + timedelta(days=7)
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    return jwt_codec.encode(payload, JWT_KEY, algorithm=JWT_ALGORITHM)
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    cached = token_cache.get(token)
+    if cached and cached[1] > datetime.now(timezone.utc).timestamp():
+        return cached[0]
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user = await db.users.find_one({"id": payload["user_id"]}, {"_id": 0})
+        payload = jwt_codec.decode(token, JWT_KEY, algorithms=[JWT_ALGORITHM])
+        user = await db.users.find_one({"id": payload["user_id"]}, USER_PROJECTION)
         if not user:
             raise HTTPException(status_code=401, detail="Usuario no encontrado")
-        return User(**user)
+        user = User.model_validate(user)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expirado")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Token inválido")
+    async with token_cache_lock:
+        token_cache[token] = (user, payload["exp"])
+    return user
 
-def calculate_days_available(user: User, permits: List[Permit]) -> DaysAvailable:
+async def get_days_used(teacher_id: str) -> tuple[int, int]:
+    if teacher_id in days_used_cache:
+        return days_used_cache[teacher_id]
+    totals = await db.permits.aggregate([
+        {"$match": {"teacher_id": teacher_id, "status": PermitStatus.APPROVED}},
+        {"$group": {"_id": "$permit_type", "total": {"$sum": "$days_requested"}}}
+    ]).to_list(None)
+    used = {t["_id"]: t["total"] for t in totals}
+    days_used = used.get(PermitType.VACATION_57.value, 0), used.get(PermitType.ECONOMIC_62.value, 0)
+    days_used_cache[teacher_id] = days_used
+    return days_used
+
+def calculate_days_available(user: User, vacation_used: int, economic_used: int) -> DaysAvailable:
     if not user.hire_date or not user.contract_type:
         return DaysAvailable(
             vacation_period_1=0, vacation_period_2=0, vacation_additional=0,
@@ -168,10 +243,6 @@ def calculate_days_available(user: User, permits: List[Permit]) -> DaysAvailable
     economic_additional = int(years_of_service / 10)
     economic_days = economic_base + economic_additional
     
-    approved_permits = [p for p in permits if p.status == PermitStatus.APPROVED]
-    vacation_used = sum(p.days_requested for p in approved_permits if p.permit_type == PermitType.VACATION_57)
-    economic_used = sum(p.days_requested for p in approved_permits if p.permit_type == PermitType.ECONOMIC_62)
-    
     total_vacation_available = vacation_period_1 + vacation_period_2 + vacation_additional
     total_economic_available = economic_days
     
@@ -184,24 +255,35 @@ def calculate_days_available(user: User, permits: List[Permit]) -> DaysAvailable
         total_economic=max(0, total_economic_available - economic_used)
     )
 
+async def find_page(collection, query: dict, projection: dict, limit: int, after_id: Optional[str]) -> ORJSONResponse:
+    if after_id:
+        if not ObjectId.is_valid(after_id):
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        query = {**query, "_id": {"$gt": ObjectId(after_id)}}
+    
+    docs = await collection.find(query, {**projection, "_id": 1}).sort("_id", 1).limit(limit).to_list(limit)
+    headers = {"X-Next-Cursor": str(docs[-1]["_id"])} if len(docs) == limit else None
+    for doc in docs:
+        del doc["_id"]
+    return ORJSONResponse(docs, headers=headers)
+
 @api_router.post("/auth/register")
 async def register(user_data: UserCreate, current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Solo administradores pueden registrar usuarios")
     
-    existing = await db.users.find_one({"email": user_data.email}, {"_id": 0})
+    existing = await db.users.find_one({"email": user_data.email}, {"_id": 0, "id": 1})
     if existing:
         raise HTTPException(status_code=400, detail="El email ya está registrado")
     
     user_dict = user_data.model_dump()
-    user_dict["password"] = hash_password(user_dict["password"])
+    user_dict["password"] = await asyncio.get_running_loop().run_in_executor(
+        password_pool, hash_password, user_dict["password"]
+    )
     user = User(**{k: v for k, v in user_dict.items() if k != "password"})
     
     doc = user.model_dump()
     doc["password"] = user_dict["password"]
-    for key in ["created_at", "hire_date"]:
-        if key in doc and doc[key]:
-            doc[key] = doc[key].isoformat()
     
     await db.users.insert_one(doc)
     
@@ -210,24 +292,24 @@ async def register(user_data: UserCreate, current_user: User = Depends(get_curre
         title="Cuenta creada",
         message=f"Bienvenido {user.name}, tu cuenta ha sido creada exitosamente."
     )
-    notif_doc = notification.model_dump()
-    notif_doc["created_at"] = notif_doc["created_at"].isoformat()
-    await db.notifications.insert_one(notif_doc)
+    await db.notifications.insert_one(notification.model_dump())
     
     return user
 
 @api_router.post("/auth/login")
 async def login(credentials: LoginRequest):
-    user_doc = await db.users.find_one({"email": credentials.email}, {"_id": 0})
-    if not user_doc or not verify_password(credentials.password, user_doc["password"]):
+    loop = asyncio.get_running_loop()
+    user_doc = await db.users.find_one({"email": credentials.email}, {**USER_PROJECTION, "password": 1})
+    if not user_doc or not await loop.run_in_executor(
+        password_pool, verify_password, credentials.password, user_doc["password"]
+    ):
         raise HTTPException(status_code=401, detail="Credenciales inválidas")
     
-    if isinstance(user_doc.get("created_at"), str):
-        user_doc["created_at"] = datetime.fromisoformat(user_doc["created_at"])
-    if isinstance(user_doc.get("hire_date"), str):
-        user_doc["hire_date"] = datetime.fromisoformat(user_doc["hire_date"])
+    if is_legacy_hash(user_doc["password"]):
+        new_hash = await loop.run_in_executor(password_pool, hash_password, credentials.password)
+        await db.users.update_one({"id": user_doc["id"]}, {"$set": {"password": new_hash}})
     
-    user = User(**user_doc)
+    user = User.model_validate(user_doc)
     token = create_token(user.id, user.email, user.role)
     
     return {"token": token, "user": user}
@@ -237,58 +319,39 @@ async def get_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 @api_router.get("/teachers", response_model=List[User])
-async def get_teachers(current_user: User = Depends(get_current_user)):
+async def get_teachers(
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after_id: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Acceso denegado")
     
-    teachers = await db.users.find({"role": UserRole.TEACHER}, {"_id": 0}).to_list(1000)
-    for teacher in teachers:
-        if isinstance(teacher.get("created_at"), str):
-            teacher["created_at"] = datetime.fromisoformat(teacher["created_at"])
-        if isinstance(teacher.get("hire_date"), str):
-            teacher["hire_date"] = datetime.fromisoformat(teacher["hire_date"])
-    return [User(**t) for t in teachers]
+    return await find_page(db.users, {"role": UserRole.TEACHER}, USER_PROJECTION, limit, after_id)
 
 @api_router.get("/teachers/{teacher_id}/days", response_model=DaysAvailable)
 async def get_teacher_days(teacher_id: str, current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.ADMIN and current_user.id != teacher_id:
         raise HTTPException(status_code=403, detail="Acceso denegado")
     
-    teacher_doc = await db.users.find_one({"id": teacher_id}, {"_id": 0})
+    teacher_doc, (vacation_used, economic_used) = await asyncio.gather(
+        db.users.find_one({"id": teacher_id}, USER_PROJECTION),
+        get_days_used(teacher_id)
+    )
     if not teacher_doc:
         raise HTTPException(status_code=404, detail="Maestro no encontrado")
     
-    if isinstance(teacher_doc.get("created_at"), str):
-        teacher_doc["created_at"] = datetime.fromisoformat(teacher_doc["created_at"])
-    if isinstance(teacher_doc.get("hire_date"), str):
-        teacher_doc["hire_date"] = datetime.fromisoformat(teacher_doc["hire_date"])
+    teacher = User.model_validate(teacher_doc)
     
-    teacher = User(**teacher_doc)
-    
-    permits_docs = await db.permits.find({"teacher_id": teacher_id}, {"_id": 0}).to_list(1000)
-    permits = []
-    for p in permits_docs:
-        for key in ["start_date", "end_date", "created_at", "reviewed_at"]:
-            if key in p and p[key] and isinstance(p[key], str):
-                p[key] = datetime.fromisoformat(p[key])
-        permits.append(Permit(**p))
-    
-    return calculate_days_available(teacher, permits)
+    return calculate_days_available(teacher, vacation_used, economic_used)
 
 @api_router.post("/permits", response_model=Permit)
 async def create_permit(permit_data: PermitCreate, current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.TEACHER:
         raise HTTPException(status_code=403, detail="Solo profesores pueden solicitar permisos")
     
-    permits_docs = await db.permits.find({"teacher_id": current_user.id}, {"_id": 0}).to_list(1000)
-    permits = []
-    for p in permits_docs:
-        for key in ["start_date", "end_date", "created_at", "reviewed_at"]:
-            if key in p and p[key] and isinstance(p[key], str):
-                p[key] = datetime.fromisoformat(p[key])
-        permits.append(Permit(**p))
-    
-    days_available = calculate_days_available(current_user, permits)
+    vacation_used, economic_used = await get_days_used(current_user.id)
+    days_available = calculate_days_available(current_user, vacation_used, economic_used)
     
     if permit_data.permit_type == PermitType.VACATION_57:
         if permit_data.days_requested > days_available.total_vacation:
@@ -303,67 +366,60 @@ async def create_permit(permit_data: PermitCreate, current_user: User = Depends(
         **permit_data.model_dump()
     )
     
-    doc = permit.model_dump()
-    for key in ["start_date", "end_date", "created_at", "reviewed_at"]:
-        if key in doc and doc[key]:
-            doc[key] = doc[key].isoformat()
-    
-    await db.permits.insert_one(doc)
-    
-    admins = await db.users.find({"role": UserRole.ADMIN}, {"_id": 0}).to_list(100)
-    for admin in admins:
-        notification = Notification(
+    _, admins = await asyncio.gather(
+        db.permits.insert_one(permit.model_dump()),
+        db.users.find({"role": UserRole.ADMIN}, {"_id": 0, "id": 1}).to_list(100)
+    )
+    notif_docs = [
+        Notification(
             user_id=admin["id"],
             title="Nueva solicitud de permiso",
             message=f"{current_user.name} ha solicitado un permiso de {permit.days_requested} días."
-        )
-        notif_doc = notification.model_dump()
-        notif_doc["created_at"] = notif_doc["created_at"].isoformat()
-        await db.notifications.insert_one(notif_doc)
+        ).model_dump()
+        for admin in admins
+    ]
+    if notif_docs:
+        await db.notifications.insert_many(notif_docs, ordered=False)
     
     return permit
 
 @api_router.get("/permits", response_model=List[Permit])
-async def get_permits(current_user: User = Depends(get_current_user)):
-    if current_user.role == UserRole.ADMIN:
-        permits_docs = await db.permits.find({}, {"_id": 0}).to_list(1000)
-    else:
-        permits_docs = await db.permits.find({"teacher_id": current_user.id}, {"_id": 0}).to_list(1000)
-    
-    permits = []
-    for p in permits_docs:
-        for key in ["start_date", "end_date", "created_at", "reviewed_at"]:
-            if key in p and p[key] and isinstance(p[key], str):
-                p[key] = datetime.fromisoformat(p[key])
-        permits.append(Permit(**p))
-    
-    return permits
+async def get_permits(
+    status: Optional[PermitStatus] = None,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after_id: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    query = {} if current_user.role == UserRole.ADMIN else {"teacher_id": current_user.id}
+    if status:
+        query["status"] = status
+    
+    return await find_page(db.permits, query, PERMIT_PROJECTION, limit, after_id)
 
 @api_router.put("/permits/{permit_id}/review", response_model=Permit)
 async def review_permit(permit_id: str, review: PermitReview, current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Solo administradores pueden revisar permisos")
     
-    permit_doc = await db.permits.find_one({"id": permit_id}, {"_id": 0})
-    if not permit_doc:
-        raise HTTPException(status_code=404, detail="Permiso no encontrado")
-    
     update_data = {
         "status": review.status,
-        "reviewed_at": datetime.now(timezone.utc).isoformat(),
+        "reviewed_at": datetime.now(timezone.utc),
         "reviewed_by": current_user.name
     }
     if review.rejection_reason:
         update_data["rejection_reason"] = review.rejection_reason
     
-    await db.permits.update_one({"id": permit_id}, {"$set": update_data})
-    
-    permit_doc.update(update_data)
-    for key in ["start_date", "end_date", "created_at", "reviewed_at"]:
-        if key in permit_doc and permit_doc[key] and isinstance(permit_doc[key], str):
-            permit_doc[key] = datetime.fromisoformat(permit_doc[key])
+    permit_doc = await db.permits.find_one_and_update(
+        {"id": permit_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if not permit_doc:
+        raise HTTPException(status_code=404, detail="Permiso no encontrado")
+    days_used_cache.pop(permit_doc["teacher_id"], None)
     
-    permit = Permit(**permit_doc)
+    permit = Permit.model_validate(permit_doc)
     
     status_text = "aprobada" if review.status == PermitStatus.APPROVED else "rechazada"
     notification = Notification(
@@ -371,25 +427,17 @@ async def review_permit(permit_id: str, review: PermitReview, current_user: User
         title=f"Solicitud {status_text}",
         message=f"Tu solicitud de permiso ha sido {status_text} por {current_user.name}."
     )
-    notif_doc = notification.model_dump()
-    notif_doc["created_at"] = notif_doc["created_at"].isoformat()
-    await db.notifications.insert_one(notif_doc)
+    await db.notifications.insert_one(notification.model_dump())
     
     return permit
 
 @api_router.get("/notifications", response_model=List[Notification])
 async def get_notifications(current_user: User = Depends(get_current_user)):
     notifications_docs = await db.notifications.find(
-        {"user_id": current_user.id}, {"_id": 0}
+        {"user_id": current_user.id}, NOTIFICATION_PROJECTION
     ).sort("created_at", -1).to_list(100)
     
-    notifications = []
-    for n in notifications_docs:
-        if isinstance(n.get("created_at"), str):
-            n["created_at"] = datetime.fromisoformat(n["created_at"])
-        notifications.append(Notification(**n))
-    
-    return notifications
+    return ORJSONResponse(notifications_docs)
 
 @api_router.put("/notifications/{notification_id}/read")
 async def mark_notification_read(notification_id: str, current_user: User = Depends(get_current_user)):
@@ -406,26 +454,45 @@ async def get_stats(current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Acceso denegado")
     
-    total_teachers = await db.users.count_documents({"role": UserRole.TEACHER})
-    pending_requests = await db.permits.count_documents({"status": PermitStatus.PENDING})
-    active_permits = await db.permits.count_documents({
-        "status": PermitStatus.APPROVED,
-        "start_date": {"$lte": datetime.now(timezone.utc).isoformat()},
-        "end_date": {"$gte": datetime.now(timezone.utc).isoformat()}
-    })
-    
-    today = datetime.now(timezone.utc).date()
-    todays_absences = await db.permits.count_documents({
-        "status": PermitStatus.APPROVED,
-        "start_date": {"$lte": datetime.combine(today, datetime.max.time(), tzinfo=timezone.utc).isoformat()},
-        "end_date": {"$gte": datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc).isoformat()}
-    })
+    now = datetime.now(timezone.utc)
+    today = now.date()
+    permit_counts = db.permits.aggregate([
+        {"$match": {"status": {"$in": [PermitStatus.PENDING, PermitStatus.APPROVED]}}},
+        {"$facet": {
+            "pending": [
+                {"$match": {"status": PermitStatus.PENDING}},
+                {"$count": "n"}
+            ],
+            "active": [
+                {"$match": {
+                    "status": PermitStatus.APPROVED,
+                    "start_date": {"$lte": now},
+                    "end_date": {"$gte": now}
+                }},
+                {"$count": "n"}
+            ],
+            "todays": [
+                {"$match": {
+                    "status": PermitStatus.APPROVED,
+                    "start_date": {"$lte": datetime.combine(today, datetime.max.time(), tzinfo=timezone.utc)},
+                    "end_date": {"$gte": datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc)}
+                }},
+                {"$count": "n"}
+            ]
+        }}
+    ]).to_list(1)
+    
+    total_teachers, facets = await asyncio.gather(
+        db.users.count_documents({"role": UserRole.TEACHER}),
+        permit_counts
+    )
+    counts = {name: result[0]["n"] if result else 0 for name, result in facets[0].items()}
     
     return {
         "total_teachers": total_teachers,
-        "pending_requests": pending_requests,
-        "active_permits": active_permits,
-        "todays_absences": todays_absences
+        "pending_requests": counts["pending"],
+        "active_permits": counts["active"],
+        "todays_absences": counts["todays"]
     }
 
 app.include_router(api_router)
@@ -433,9 +500,10 @@ app.include_router(api_router)
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
-    allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
+    allow_origins=settings.cors_origins,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 logging.basicConfig(
@@ -444,6 +512,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def warm_up_db_client():
+    await db.command("ping")
+
+@app.on_event("startup")
+async def create_indexes():
+    await asyncio.gather(
+        db.users.create_index("email", unique=True),
+        db.users.create_index("id", unique=True),
+        db.users.create_index("role"),
+        db.permits.create_index("id", unique=True),
+        db.permits.create_index([("teacher_id", 1), ("status", 1)]),
+        db.permits.create_index([("status", 1), ("start_date", 1), ("end_date", 1)]),
+        db.notifications.create_index("id"),
+        db.notifications.create_index([("user_id", 1), ("created_at", -1)]),
+    )
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
+    password_pool.shutdown(wait=False)
\ No newline at end of file
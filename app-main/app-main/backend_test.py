@@ -4,30 +4,115 @@ Backend API Testing for Vacation Permission Management System
 Tests all endpoints with admin and teacher credentials
 """
 
-import requests
+import asyncio
+import hashlib
+import httpx
+import orjson
+import os
 import sys
 import json
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+# USE_MOCK=record hits the real API and saves every response as a fixture,
+# USE_MOCK=1 replays those fixtures without touching the network.
+MOCK_MODE = os.environ.get("USE_MOCK", "")
+FIXTURES_DIR = Path(__file__).parent / "tests" / "fixtures"
+CLOCK_FIXTURE = FIXTURES_DIR / "clock.json"
+
+# Transient gateway errors are retried for idempotent methods only, so a
+# retried POST can never create a permit or user twice.
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.2
+RETRY_STATUSES = {502, 503, 504}
+RETRY_METHODS = {'GET', 'PUT'}
+
+def fixture_path(request: httpx.Request) -> Path:
+    """Fixture file for a request, keyed by method, URL, caller token and canonical JSON body"""
+    body = json.dumps(json.loads(request.content), sort_keys=True) if request.content else ""
+    token = request.headers.get("authorization", "")
+    key = hashlib.sha256(f"{request.method}{request.url}{token}{body}".encode("utf-8")).hexdigest()
+    return FIXTURES_DIR / f"{key}.json"
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Forward requests to a real transport and save each response as a fixture"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        content = await response.aread()
+        content_type = response.headers.get("content-type", "")
+        fixture_path(request).write_text(json.dumps({
+            "method": request.method,
+            "url": str(request.url),
+            "body": request.content.decode("utf-8"),
+            "status": response.status_code,
+            "content_type": content_type,
+            "response": content.decode("utf-8")
+        }, indent=2, ensure_ascii=False), encoding="utf-8")
+        return httpx.Response(
+            response.status_code, headers={"content-type": content_type}, content=content, request=request
+        )
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+def replay_fixture(request: httpx.Request) -> httpx.Response:
+    """Serve a previously recorded response from disk"""
+    path = fixture_path(request)
+    if not path.exists():
+        return httpx.Response(404, json={"error": f"No fixture recorded for {request.method} {request.url}"})
+    record = json.loads(path.read_text(encoding="utf-8"))
+    return httpx.Response(
+        record["status"], headers={"content-type": record["content_type"]}, content=record["response"].encode("utf-8")
+    )
 
 class VacationSystemTester:
-    def __init__(self, base_url="https://school-pto-system.preview.emergentagent.com"):
+    def __init__(self, base_url="https://school-pto-system.preview.emergentagent.com", verbose: bool = False):
         self.base_url = base_url
+        self.verbose = verbose
+        limits = httpx.Limits(max_keepalive_connections=20, max_connections=20)
+        transport = httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=MAX_RETRIES)
+        if MOCK_MODE == "record":
+            FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+            transport = RecordingTransport(transport)
+            self.now = datetime.now()
+            CLOCK_FIXTURE.write_text(json.dumps({"now": self.now.isoformat()}), encoding="utf-8")
+        elif MOCK_MODE:
+            transport = httpx.MockTransport(replay_fixture)
+            self.now = datetime.fromisoformat(json.loads(CLOCK_FIXTURE.read_text(encoding="utf-8"))["now"])
+        else:
+            self.now = datetime.now()
+        # Request bodies derive their dates from self.now so replayed runs
+        # produce the same fixture keys as the recorded one.
+        self.client = httpx.AsyncClient(
+            base_url=f"{base_url}/api/",
+            timeout=30.0,
+            transport=transport
+        )
         self.admin_token = None
         self.teacher_token = None
         self.teacher_id = None
         self.tests_run = 0
         self.tests_passed = 0
         self.test_results = []
+        self._log_buffer = []
+
+    async def close(self):
+        """Close the underlying HTTP connection pool"""
+        await self.client.aclose()
 
     def log_test(self, name: str, success: bool, details: str = ""):
-        """Log test result"""
+        """Log test result; output is buffered until flush_log"""
         self.tests_run += 1
         if success:
             self.tests_passed += 1
-            print(f"✅ {name}")
+            self._log_buffer.append(f"✅ {name}")
         else:
-            print(f"❌ {name} - {details}")
+            self._log_buffer.append(f"❌ {name} - {details}")
         
         self.test_results.append({
             "test": name,
@@ -35,46 +120,64 @@ class VacationSystemTester:
             "details": details
         })
 
-    def make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, 
-                    token: Optional[str] = None, expected_status: int = 200) -> tuple[bool, Dict]:
-        """Make HTTP request and return success status and response data"""
-        url = f"{self.base_url}/api/{endpoint}"
+    def flush_log(self):
+        """Write buffered log lines to stdout in one call"""
+        if self._log_buffer:
+            sys.stdout.write("\n".join(self._log_buffer) + "\n")
+            self._log_buffer.clear()
+
+    async def make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, 
+                    token: Optional[str] = None, expected_status: Optional[Union[int, range]] = None,
+                    decode: bool = True) -> tuple[bool, Dict]:
+        """Make HTTP request and return success status and response data
+
+        expected_status defaults to any 2xx code; decode=False skips parsing the body.
+        """
         headers = {'Content-Type': 'application/json'}
         
         if token:
             headers['Authorization'] = f'Bearer {token}'
 
+        if method not in ('GET', 'POST', 'PUT'):
+            return False, {"error": f"Unsupported method: {method}"}
+
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=30)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=30)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers, timeout=30)
-            else:
-                return False, {"error": f"Unsupported method: {method}"}
+            for attempt in range(MAX_RETRIES + 1):
+                response = await self.client.request(method, endpoint, json=data, headers=headers)
+                if (response.status_code not in RETRY_STATUSES or method not in RETRY_METHODS
+                        or attempt == MAX_RETRIES):
+                    break
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
 
-            success = response.status_code == expected_status
+            if expected_status is None:
+                success = response.is_success
+            elif isinstance(expected_status, range):
+                success = response.status_code in expected_status
+            else:
+                success = response.status_code == expected_status
             
-            try:
+            if not decode:
+                response_data = {"status_code": response.status_code}
+            elif "json" in response.headers.get("content-type", ""):
                 response_data = response.json()
-            except:
+            else:
                 response_data = {"status_code": response.status_code, "text": response.text}
 
-            if not success:
-                print(f"   Status: {response.status_code}, Expected: {expected_status}")
+            if not success and self.verbose:
+                self._log_buffer.append(f"   Status: {response.status_code}, Expected: {expected_status or '2xx'}")
                 if response.text:
-                    print(f"   Response: {response.text[:200]}")
+                    self._log_buffer.append(f"   Response: {response.text[:200]}")
 
             return success, response_data
 
-        except requests.exceptions.RequestException as e:
-            print(f"   Request failed: {str(e)}")
+        except httpx.HTTPError as e:
+            if self.verbose:
+                self._log_buffer.append(f"   Request failed: {str(e)}")
             return False, {"error": str(e)}
 
-    def test_admin_login(self):
+    async def test_admin_login(self):
         """Test admin login"""
-        success, response = self.make_request(
+        success, response = await self.make_request(
             'POST', 'auth/login',
             data={"email": "admin@universidad.edu", "password": "admin123"}
         )
@@ -87,9 +190,9 @@ class VacationSystemTester:
             self.log_test("Admin Login", False, f"Response: {response}")
             return False
 
-    def test_teacher_login(self):
+    async def test_teacher_login(self):
         """Test teacher login"""
-        success, response = self.make_request(
+        success, response = await self.make_request(
             'POST', 'auth/login',
             data={"email": "profesor@universidad.edu", "password": "profesor123"}
         )
@@ -103,9 +206,9 @@ class VacationSystemTester:
             self.log_test("Teacher Login", False, f"Response: {response}")
             return False
 
-    def test_admin_stats(self):
+    async def test_admin_stats(self):
         """Test admin statistics endpoint"""
-        success, response = self.make_request(
+        success, response = await self.make_request(
             'GET', 'stats', token=self.admin_token
         )
         
@@ -117,9 +220,9 @@ class VacationSystemTester:
             self.log_test("Admin Stats", False, f"Response: {response}")
             return False
 
-    def test_get_teachers(self):
+    async def test_get_teachers(self):
         """Test getting teachers list"""
-        success, response = self.make_request(
+        success, response = await self.make_request(
             'GET', 'teachers', token=self.admin_token
         )
         
@@ -130,9 +233,9 @@ class VacationSystemTester:
             self.log_test("Get Teachers List", False, f"Response: {response}")
             return False
 
-    def test_teacher_days_calculation(self):
+    async def test_teacher_days_calculation(self):
         """Test teacher days calculation"""
-        success, response = self.make_request(
+        success, response = await self.make_request(
             'GET', f'teachers/{self.teacher_id}/days', token=self.teacher_token
         )
         
@@ -147,9 +250,9 @@ class VacationSystemTester:
             self.log_test("Teacher Days Calculation", False, f"Response: {response}")
             return False
 
-    def test_create_vacation_permit(self):
+    async def test_create_vacation_permit(self):
         """Test creating vacation permit"""
-        start_date = datetime.now() + timedelta(days=30)
+        start_date = self.now + timedelta(days=30)
         end_date = start_date + timedelta(days=4)
         
         permit_data = {
@@ -160,8 +263,8 @@ class VacationSystemTester:
             "reason": "Vacaciones familiares de prueba"
         }
         
-        success, response = self.make_request(
-            'POST', 'permits', data=permit_data, token=self.teacher_token, expected_status=200
+        success, response = await self.make_request(
+            'POST', 'permits', data=permit_data, token=self.teacher_token
         )
         
         if success and 'id' in response:
@@ -172,9 +275,9 @@ class VacationSystemTester:
             self.log_test("Create Vacation Permit", False, f"Response: {response}")
             return False
 
-    def test_create_economic_permit(self):
+    async def test_create_economic_permit(self):
         """Test creating economic permit"""
-        start_date = datetime.now() + timedelta(days=60)
+        start_date = self.now + timedelta(days=60)
         end_date = start_date + timedelta(days=1)
         
         permit_data = {
@@ -185,8 +288,8 @@ class VacationSystemTester:
             "reason": "Asuntos personales de prueba"
         }
         
-        success, response = self.make_request(
-            'POST', 'permits', data=permit_data, token=self.teacher_token, expected_status=200
+        success, response = await self.make_request(
+            'POST', 'permits', data=permit_data, token=self.teacher_token
         )
         
         if success and 'id' in response:
@@ -197,9 +300,9 @@ class VacationSystemTester:
             self.log_test("Create Economic Permit", False, f"Response: {response}")
             return False
 
-    def test_get_permits_admin(self):
+    async def test_get_permits_admin(self):
         """Test admin getting all permits"""
-        success, response = self.make_request(
+        success, response = await self.make_request(
             'GET', 'permits', token=self.admin_token
         )
         
@@ -210,9 +313,9 @@ class VacationSystemTester:
             self.log_test("Admin Get All Permits", False, f"Response: {response}")
             return False
 
-    def test_get_permits_teacher(self):
+    async def test_get_permits_teacher(self):
         """Test teacher getting own permits"""
-        success, response = self.make_request(
+        success, response = await self.make_request(
             'GET', 'permits', token=self.teacher_token
         )
         
@@ -223,7 +326,7 @@ class VacationSystemTester:
             self.log_test("Teacher Get Own Permits", False, f"Response: {response}")
             return False
 
-    def test_approve_permit(self):
+    async def test_approve_permit(self):
         """Test admin approving a permit"""
         if not hasattr(self, 'permit_id'):
             self.log_test("Approve Permit", False, "No permit ID available")
@@ -231,7 +334,7 @@ class VacationSystemTester:
             
         review_data = {"status": "approved"}
         
-        success, response = self.make_request(
+        success, response = await self.make_request(
             'PUT', f'permits/{self.permit_id}/review', 
             data=review_data, token=self.admin_token
         )
@@ -243,7 +346,7 @@ class VacationSystemTester:
             self.log_test("Approve Permit", False, f"Response: {response}")
             return False
 
-    def test_reject_permit(self):
+    async def test_reject_permit(self):
         """Test admin rejecting a permit"""
         if not hasattr(self, 'economic_permit_id'):
             self.log_test("Reject Permit", False, "No economic permit ID available")
@@ -254,7 +357,7 @@ class VacationSystemTester:
             "rejection_reason": "Motivo de prueba para rechazo"
         }
         
-        success, response = self.make_request(
+        success, response = await self.make_request(
             'PUT', f'permits/{self.economic_permit_id}/review', 
             data=review_data, token=self.admin_token
         )
@@ -266,9 +369,9 @@ class VacationSystemTester:
             self.log_test("Reject Permit", False, f"Response: {response}")
             return False
 
-    def test_notifications(self):
+    async def test_notifications(self):
         """Test notifications endpoint"""
-        success, response = self.make_request(
+        success, response = await self.make_request(
             'GET', 'notifications', token=self.teacher_token
         )
         
@@ -279,10 +382,10 @@ class VacationSystemTester:
             self.log_test("Get Notifications", False, f"Response: {response}")
             return False
 
-    def test_register_new_teacher(self):
+    async def test_register_new_teacher(self):
         """Test admin registering a new teacher"""
         teacher_data = {
-            "email": f"test.teacher.{datetime.now().strftime('%H%M%S')}@universidad.edu",
+            "email": f"test.teacher.{self.now.strftime('%H%M%S')}@universidad.edu",
             "password": "testpass123",
             "name": "Profesor de Prueba",
             "role": "teacher",
@@ -290,7 +393,7 @@ class VacationSystemTester:
             "hire_date": "2018-01-15T00:00:00Z"
         }
         
-        success, response = self.make_request(
+        success, response = await self.make_request(
             'POST', 'auth/register', data=teacher_data, token=self.admin_token
         )
         
@@ -301,40 +404,51 @@ class VacationSystemTester:
             self.log_test("Register New Teacher", False, f"Response: {response}")
             return False
 
-    def run_all_tests(self):
+    async def run_all_tests(self):
         """Run all backend tests"""
         print("🚀 Starting Backend API Tests for Vacation Permission System")
         print("=" * 60)
         
         # Authentication tests
-        if not self.test_admin_login():
+        admin_ok, teacher_ok = await asyncio.gather(
+            self.test_admin_login(),
+            self.test_teacher_login()
+        )
+        if not admin_ok:
+            self.flush_log()
             print("❌ Admin login failed - stopping tests")
             return False
             
-        if not self.test_teacher_login():
+        if not teacher_ok:
+            self.flush_log()
             print("❌ Teacher login failed - stopping tests")
             return False
 
-        # Admin functionality tests
-        self.test_admin_stats()
-        self.test_get_teachers()
-        self.test_register_new_teacher()
-
-        # Teacher functionality tests
-        self.test_teacher_days_calculation()
-        self.test_create_vacation_permit()
-        self.test_create_economic_permit()
+        # Independent read tests and teacher registration
+        await asyncio.gather(
+            self.test_admin_stats(),
+            self.test_get_teachers(),
+            self.test_register_new_teacher(),
+            self.test_teacher_days_calculation(),
+            self.test_get_permits_admin(),
+            self.test_get_permits_teacher(),
+            self.test_notifications()
+        )
 
-        # Permit management tests
-        self.test_get_permits_admin()
-        self.test_get_permits_teacher()
-        self.test_approve_permit()
-        self.test_reject_permit()
+        # Permit creation tests
+        await asyncio.gather(
+            self.test_create_vacation_permit(),
+            self.test_create_economic_permit()
+        )
 
-        # Notification tests
-        self.test_notifications()
+        # Permit review tests
+        await asyncio.gather(
+            self.test_approve_permit(),
+            self.test_reject_permit()
+        )
 
         # Print summary
+        self.flush_log()
         print("\n" + "=" * 60)
         print(f"📊 Test Results: {self.tests_passed}/{self.tests_run} passed")
         
@@ -345,9 +459,15 @@ class VacationSystemTester:
             print(f"⚠️  {self.tests_run - self.tests_passed} tests failed")
             return False
 
+async def run_suite(tester: VacationSystemTester) -> bool:
+    try:
+        return await tester.run_all_tests()
+    finally:
+        await tester.close()
+
 def main():
-    tester = VacationSystemTester()
-    success = tester.run_all_tests()
+    tester = VacationSystemTester(verbose="-v" in sys.argv)
+    success = asyncio.run(run_suite(tester))
     
     # Save detailed results
     results = {
@@ -358,8 +478,8 @@ def main():
         "test_details": tester.test_results
     }
     
-    with open('/app/backend_test_results.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    with open('/app/backend_test_results.json', 'wb') as f:
+        f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
     
     return 0 if success else 1
 
@@ -0,0 +1,43 @@
+import asyncio
+import os
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+mongo_url = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+db_name = os.environ.get("DB_NAME", "test_database")
+
+DATE_FIELDS = {
+    "users": ["created_at", "hire_date"],
+    "permits": ["start_date", "end_date", "created_at", "reviewed_at"],
+    "notifications": ["created_at"],
+}
+
+async def migrate_collection(collection, fields):
+    query = {"$or": [{field: {"$type": "string"}} for field in fields]}
+    updates = []
+    async for doc in collection.find(query, {field: 1 for field in fields}):
+        converted = {
+            field: datetime.fromisoformat(doc[field])
+            for field in fields
+            if isinstance(doc.get(field), str)
+        }
+        updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": converted}))
+    
+    if updates:
+        await collection.bulk_write(updates, ordered=False)
+    return len(updates)
+
+async def migrate_dates():
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+    
+    for name, fields in DATE_FIELDS.items():
+        count = await migrate_collection(db[name], fields)
+        print(f"✓ {name}: {count} documentos convertidos")
+    
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(migrate_dates())
@@ -6,24 +6,38 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime, timezone, timedelta
 import os
 import bcrypt
+from functools import cache
 
 mongo_url = "mongodb://localhost:27017"
 db_name = "test_database"
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+TWO_YEARS = timedelta(days=365*2)
+FOUR_YEARS = timedelta(days=365*4)
+SEVEN_YEARS = timedelta(days=365*7)
+TEN_YEARS = timedelta(days=365*10)
+
+# Seed credentials are fixed test data, so a low bcrypt cost is enough and
+# each distinct password is hashed only once. The server upgrades these
+# hashes to argon2 on the first successful login.
+@cache
+def hash_password(password: str, rounds: int = 4) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
 
 async def seed_database():
     client = AsyncIOMotorClient(mongo_url)
     db = client[db_name]
     
     # Clear existing data
-    await db.users.delete_many({})
-    await db.permits.delete_many({})
-    await db.notifications.delete_many({})
+    await asyncio.gather(
+        db.users.delete_many({}),
+        db.permits.delete_many({}),
+        db.notifications.delete_many({})
+    )
     
     print("Base de datos limpiada...")
     
+    now = datetime.now(timezone.utc)
+    
     # Create admin user
     admin = {
         "id": "admin-001",
@@ -31,10 +45,8 @@ async def seed_database():
         "password": hash_password("admin123"),
         "name": "Administrador Principal",
         "role": "admin",
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": now
     }
-    await db.users.insert_one(admin)
-    print("✓ Administrador creado: admin@universidad.edu / admin123")
     
     # Create teacher user
     teacher = {
@@ -44,11 +56,9 @@ async def seed_database():
         "name": "María García López",
         "role": "teacher",
         "contract_type": "full_time",
-        "hire_date": (datetime.now(timezone.utc) - timedelta(days=365*7)).isoformat(),  # 7 years ago
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "hire_date": now - SEVEN_YEARS,  # 7 years ago
+        "created_at": now
     }
-    await db.users.insert_one(teacher)
-    print("✓ Profesor creado: profesor@universidad.edu / profesor123")
     
     # Create additional teachers
     teachers = [
@@ -59,8 +69,8 @@ async def seed_database():
             "name": "Juan Pérez Martínez",
             "role": "teacher",
             "contract_type": "full_time",
-            "hire_date": (datetime.now(timezone.utc) - timedelta(days=365*10)).isoformat(),
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "hire_date": now - TEN_YEARS,
+            "created_at": now
         },
         {
             "id": "teacher-003",
@@ -69,8 +79,8 @@ async def seed_database():
             "name": "Ana Rodríguez Sánchez",
             "role": "teacher",
             "contract_type": "part_time",
-            "hire_date": (datetime.now(timezone.utc) - timedelta(days=365*4)).isoformat(),
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "hire_date": now - FOUR_YEARS,
+            "created_at": now
         },
         {
             "id": "teacher-004",
@@ -79,17 +89,22 @@ async def seed_database():
             "name": "Carlos López Hernández",
             "role": "teacher",
             "contract_type": "hourly",
-            "hire_date": (datetime.now(timezone.utc) - timedelta(days=365*2)).isoformat(),
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "hire_date": now - TWO_YEARS,
+            "created_at": now
         }
     ]
     
-    for t in teachers:
-        await db.users.insert_one(t)
-        print(f"✓ Profesor creado: {t['email']}")
+    all_users = [admin, teacher] + teachers
+    result = await db.users.insert_many(all_users, ordered=False)
     
-    print(f"\n✓ Base de datos inicializada con éxito!")
-    print(f"Total usuarios: {await db.users.count_documents({})}")
+    print("\n".join([
+        "✓ Administrador creado: admin@universidad.edu / admin123",
+        "✓ Profesor creado: profesor@universidad.edu / profesor123",
+        *(f"✓ Profesor creado: {t['email']}" for t in teachers),
+        "",
+        "✓ Base de datos inicializada con éxito!",
+        f"Total usuarios: {len(result.inserted_ids)}"
+    ]))
     
     client.close()
 
@@ -0,0 +1,52 @@
+"""
+Session-scoped fixtures for the backend API tests.
+Logins run once per session and share the tester's HTTP client.
+"""
+
+import os
+
+import pytest
+import pytest_asyncio
+
+from backend_test import MOCK_MODE, VacationSystemTester
+
+BACKEND_URL = os.environ.get("BACKEND_URL")
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the API tests unless a backend or recorded fixtures are available"""
+    if BACKEND_URL or MOCK_MODE:
+        return
+    skip = pytest.mark.skip(reason="set BACKEND_URL or USE_MOCK to run the API tests")
+    for item in items:
+        item.add_marker(skip)
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def tester():
+    """Tester whose HTTP client and connection pool live for the whole session"""
+    tester = VacationSystemTester(BACKEND_URL) if BACKEND_URL else VacationSystemTester()
+    yield tester
+    await tester.close()
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def admin_token(tester):
+    """Log in as admin once per session"""
+    assert await tester.test_admin_login()
+    return tester.admin_token
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def teacher_token(tester):
+    """Log in as teacher once per session"""
+    assert await tester.test_teacher_login()
+    return tester.teacher_token
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def vacation_permit_id(tester, teacher_token):
+    """Create the vacation permit reviewed by the approval test"""
+    assert await tester.test_create_vacation_permit()
+    return tester.permit_id
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def economic_permit_id(tester, teacher_token):
+    """Create the economic permit reviewed by the rejection test"""
+    assert await tester.test_create_economic_permit()
+    return tester.economic_permit_id
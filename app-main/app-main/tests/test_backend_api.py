@@ -0,0 +1,40 @@
+"""
+Backend API tests run through pytest, sharing session-scoped logins
+"""
+
+import pytest
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+async def test_admin_stats(tester, admin_token):
+    assert await tester.test_admin_stats()
+
+async def test_get_teachers(tester, admin_token):
+    assert await tester.test_get_teachers()
+
+async def test_register_new_teacher(tester, admin_token):
+    assert await tester.test_register_new_teacher()
+
+async def test_teacher_days_calculation(tester, teacher_token):
+    assert await tester.test_teacher_days_calculation()
+
+async def test_create_vacation_permit(vacation_permit_id):
+    assert vacation_permit_id
+
+async def test_create_economic_permit(economic_permit_id):
+    assert economic_permit_id
+
+async def test_get_permits_admin(tester, admin_token):
+    assert await tester.test_get_permits_admin()
+
+async def test_get_permits_teacher(tester, teacher_token):
+    assert await tester.test_get_permits_teacher()
+
+async def test_approve_permit(tester, admin_token, vacation_permit_id):
+    assert await tester.test_approve_permit()
+
+async def test_reject_permit(tester, admin_token, economic_permit_id):
+    assert await tester.test_reject_permit()
+
+async def test_notifications(tester, teacher_token):
+    assert await tester.test_notifications()